@@ -1,11 +1,21 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+
 from fastapi import FastAPI
-from fastapi.responses import JSONResponse
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage
+from fastapi.responses import ORJSONResponse
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.prompts import ChatPromptTemplate
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import BaseModel, Field
 from spyglass_ai import spyglass_trace, configure_spyglass, spyglass_chatopenai
 
+# Cache identical prompts in-process so repeated /chat messages skip the
+# provider round-trip. Acceptable for this demo endpoint; a production
+# service with temperature > 0 may prefer fresh generations per request
+set_llm_cache(InMemoryCache())
+
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -24,33 +34,122 @@ class Settings(BaseSettings):
     )
 
 
-# Load settings
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Load settings once per worker process."""
+    return Settings()
 
-# Configure Spyglass SDK programmatically
-configure_spyglass(
-    api_key=settings.spyglass_api_key,
-    deployment_id=settings.spyglass_deployment_id
-)
 
-# Initialize FastAPI app
-app = FastAPI(title="Spyglass FastAPI LangChain Example")
+# Compiled once; per-request formatting reuses the parsed template
+# instead of re-instantiating message objects
+PROMPT = ChatPromptTemplate.from_messages([("human", "{user_message}")])
 
-# Initialize LangChain ChatOpenAI
-llm = ChatOpenAI(
-    model=settings.openai_model,
-    temperature=0.7,
-    api_key=settings.openai_api_key,
-)
 
-# Instrument with Spyglass
-llm = spyglass_chatopenai(llm)
+@lru_cache(maxsize=1)
+def get_llm():
+    """Build the instrumented ChatOpenAI client once per worker process."""
+    # Imported lazily so the client is constructed after uvicorn forks
+    # workers, avoiding shared state and copy-on-write breakage
+    from langchain_openai import ChatOpenAI
+
+    settings = get_settings()
+
+    # Configure Spyglass SDK programmatically
+    configure_spyglass(
+        api_key=settings.spyglass_api_key,
+        deployment_id=settings.spyglass_deployment_id,
+    )
+
+    llm = ChatOpenAI(
+        model=settings.openai_model,
+        temperature=0.7,
+        api_key=settings.openai_api_key,
+    )
+
+    # Instrument with Spyglass
+    return spyglass_chatopenai(llm)
+
+
+class ChatBatcher:
+    """Coalesce concurrent chat requests into parallel LLM calls.
+
+    Requests arriving within a short window are drained from a queue
+    together and issued as a single asyncio.gather, overlapping the
+    network round-trips and reducing tail latency under load.
+    """
+
+    def __init__(self, chain, max_wait: float = 0.02, max_batch: int = 16):
+        self._chain = chain
+        self._max_wait = max_wait
+        self._max_batch = max_batch
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start the background batching task on the running event loop."""
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit(self, message: str):
+        """Queue a message and wait for its LLM response."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((message, future))
+        return await future
+
+    async def _drain(self) -> list:
+        """Collect queued items until the batch is full or the window closes."""
+        items = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._max_wait
+        while len(items) < self._max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                items.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return items
+
+    async def _run(self) -> None:
+        while True:
+            items = await self._drain()
+            responses = await asyncio.gather(
+                *(
+                    self._chain.ainvoke({"user_message": message})
+                    for message, _ in items
+                ),
+                return_exceptions=True,
+            )
+            for (_, future), response in zip(items, responses):
+                if isinstance(response, BaseException):
+                    future.set_exception(response)
+                else:
+                    future.set_result(response)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Initialize the LLM client and request batcher once per worker."""
+    app.state.batcher = ChatBatcher(PROMPT | get_llm())
+    app.state.batcher.start()
+    yield
+
+
+# Initialize FastAPI app
+# orjson serializes responses 3-10x faster than stdlib json
+app = FastAPI(
+    title="Spyglass FastAPI LangChain Example",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 
 class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
 
-    message: str = Field(..., description="The user message to send to the LLM")
+    message: str = Field(
+        ..., min_length=1, description="The user message to send to the LLM"
+    )
 
 
 @app.get("/")
@@ -65,15 +164,26 @@ async def root():
 async def chat(request: ChatRequest):
     """Chat endpoint that uses LangChain ChatOpenAI to generate a response."""
     try:
-        # Call LangChain ChatOpenAI
-        response = await llm.ainvoke([HumanMessage(content=request.message)])
+        # Call LangChain ChatOpenAI through the batcher
+        response = await app.state.batcher.submit(request.message)
 
         return {"response": response.content}
     except Exception as e:
-        return JSONResponse(status_code=500, content={"error": str(e)})
+        return ORJSONResponse(status_code=500, content={"error": str(e)})
 
 
 if __name__ == "__main__":
+    import os
+
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8088)
+    # uvloop and httptools ship with uvicorn[standard]; multiple workers
+    # need the app passed as an import string rather than an instance
+    uvicorn.run(
+        "fastapi-langchain:app",
+        host="0.0.0.0",
+        port=8088,
+        workers=(os.cpu_count() or 1) * 2 + 1,
+        loop="uvloop",
+        http="httptools",
+    )
@@ -1,7 +1,13 @@
+import asyncio
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 from langchain_openai import AzureChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.caches import InMemoryCache
+from langchain_core.globals import set_llm_cache
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import Field
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from spyglass_ai import (
     spyglass_azure_chatopenai,
     spyglass_trace,
@@ -11,6 +17,39 @@ from spyglass_ai import (
 # Load environment variables from .env file
 load_dotenv()
 
+# Cache identical prompts in-process so repeated demo prompts skip the
+# provider round-trip entirely
+set_llm_cache(InMemoryCache())
+
+
+class AzureSettings(BaseSettings):
+    """Application settings loaded from environment variables."""
+
+    # Spyglass configuration
+    spyglass_api_key: str = Field(..., validation_alias="SPYGLASS_API_KEY")
+    spyglass_deployment_id: str = Field(..., validation_alias="SPYGLASS_DEPLOYMENT_ID")
+
+    # Azure OpenAI configuration
+    deployment_name: str = Field(
+        default="gpt-4", validation_alias="AZURE_OPENAI_DEPLOYMENT_NAME"
+    )
+    api_version: str = Field(
+        default="2024-05-01-preview", validation_alias="OPENAI_API_VERSION"
+    )
+    model_name: str = Field(default="gpt-4", validation_alias="AZURE_OPENAI_MODEL")
+
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=False,
+        extra="ignore",
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> AzureSettings:
+    """Load settings once per process; later access is attribute lookup."""
+    return AzureSettings()
+
 
 def check_environment():
     """Check for required environment variables."""
@@ -59,22 +98,18 @@ def check_environment():
 
 
 @spyglass_trace()
-def call_azure_openai(llm, system_prompt, user_message):
+def call_azure_openai(chain, user_message):
     """Call Azure OpenAI with LangChain using sync methods.
 
     This function demonstrates sync integration with AzureChatOpenAI
-    and Spyglass tracing.
+    and Spyglass tracing. The prompt template is compiled once in main,
+    so each call only formats the user message into the prepared chain.
     """
     try:
         print(f"\nCalling Azure OpenAI with message: '{user_message}'")
-        
-        messages = [
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=user_message),
-        ]
 
         # Use sync invoke method
-        response = llm.invoke(messages)
+        response = chain.invoke({"user_message": user_message})
         
         print(f"Azure OpenAI Response: {response.content}")
         
@@ -91,21 +126,47 @@ def call_azure_openai(llm, system_prompt, user_message):
         raise
 
 
+@spyglass_trace()
+async def call_azure_openai_batch(chain, user_messages):
+    """Send multiple user messages through Azure OpenAI in one batch.
+
+    abatch fans the prompts out concurrently under the hood, so N
+    prompts complete in roughly one round-trip of latency instead of N.
+    max_concurrency caps the fan-out to stay within Azure TPM limits.
+    """
+    try:
+        print(f"\nBatching {len(user_messages)} messages through Azure OpenAI...")
+
+        inputs = [{"user_message": user_message} for user_message in user_messages]
+
+        responses = await chain.abatch(inputs, config={"max_concurrency": 10})
+
+        for user_message, response in zip(user_messages, responses):
+            print(f"Azure OpenAI Batch Response ('{user_message}'): {response.content}")
+
+        return responses
+    except Exception as e:
+        print(f"Error calling Azure OpenAI batch: {e}")
+        raise
+
+
 def main():
     """Main execution function."""
     if not check_environment():
         return
 
+    settings = get_settings()
+
     # Configure Spyglass
     configure_spyglass(
-        api_key=os.getenv("SPYGLASS_API_KEY"),
-        deployment_id=os.getenv("SPYGLASS_DEPLOYMENT_ID"),
+        api_key=settings.spyglass_api_key,
+        deployment_id=settings.spyglass_deployment_id,
     )
 
-    # Get configuration from environment
-    deployment_name = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "gpt-4")
-    api_version = os.getenv("OPENAI_API_VERSION", "2024-05-01-preview")
-    model_name = os.getenv("AZURE_OPENAI_MODEL", "gpt-4")
+    # Get configuration from settings
+    deployment_name = settings.deployment_name
+    api_version = settings.api_version
+    model_name = settings.model_name
     
     system_prompt = "You are a helpful AI assistant."
     user_message = "Tell me a short joke about programming."
@@ -123,12 +184,27 @@ def main():
         # Wrap with Spyglass tracing
         traced_llm = spyglass_azure_chatopenai(llm)
 
+        # Compile the prompt template once; per-call formatting reuses it
+        # instead of rebuilding message lists
+        prompt = ChatPromptTemplate.from_messages(
+            [("system", system_prompt), ("human", "{user_message}")]
+        )
+        chain = prompt | traced_llm
+
         print(f"\nUsing Azure deployment: {deployment_name}")
         print(f"Model name: {model_name}")
         print(f"API version: {api_version}")
 
         # Make the call
-        call_azure_openai(traced_llm, system_prompt, user_message)
+        call_azure_openai(chain, user_message)
+
+        # Demo throughput: multiple prompts batched into one call
+        batch_messages = [
+            "Tell me a short joke about programming.",
+            "Tell me a short joke about databases.",
+            "Tell me a short joke about the cloud.",
+        ]
+        asyncio.run(call_azure_openai_batch(chain, batch_messages))
 
     except Exception as e:
         print(f"Error: {e}")
@@ -1,7 +1,11 @@
+import asyncio
+import json
 import os
-import time
+import tempfile
+from functools import lru_cache
+import httpx
 import yaml
-from openai import OpenAI
+from openai import AsyncOpenAI
 import random
 from dotenv import load_dotenv
 
@@ -10,29 +14,107 @@ from spyglass_ai import spyglass_openai, spyglass_trace
 # Load environment variables from .env file
 load_dotenv()
 
+# Maximum number of in-flight completions in the worker pool
+MAX_CONCURRENCY = 10
 
+
+@lru_cache(maxsize=1)
 def load_model_config():
-    """Load model configuration from model.yaml file."""
+    """Load model configuration from model.yaml file.
+
+    The parsed result is memoized, and the libyaml C loader is used when
+    available so the YAML parse itself is roughly 10x faster.
+    """
     try:
-        with open("model.yaml", "r") as file:
-            config = yaml.safe_load(file)
+        with open("model.yaml", "rb") as file:
+            config = yaml.load(
+                file, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            )
             return config.get("model"), config.get("prompt")
     except Exception as e:
         print(f"An unexpected error occurred: {e}")
 
 
 @spyglass_trace()
-def call_openai_chat_api(model, system_prompt):
-    # Randomly raise an error 50% of the time
-    if random.random() < 0.5:
+async def batch_call_openai(client, model, system_prompt, prompts):
+    """Submit multiple prompts through the OpenAI Batch API.
+
+    Batched requests cost 50% less than the live API and get higher rate
+    limits, at the price of an up-to-24h completion window. The whole
+    submit/poll/collect cycle runs inside a single Spyglass span.
+    """
+    print(f"Submitting batch of {len(prompts)} prompts to OpenAI Batch API...")
+
+    # Write one JSONL request line per prompt
+    with tempfile.NamedTemporaryFile(
+        mode="w", suffix=".jsonl", delete=False
+    ) as batch_file:
+        for i, prompt in enumerate(prompts):
+            batch_file.write(
+                json.dumps(
+                    {
+                        "custom_id": str(i),
+                        "method": "POST",
+                        "url": "/v1/chat/completions",
+                        "body": {
+                            "model": model,
+                            "messages": [
+                                {"role": "system", "content": system_prompt},
+                                {"role": "user", "content": prompt},
+                            ],
+                        },
+                    }
+                )
+                + "\n"
+            )
+        batch_file_path = batch_file.name
+
+    try:
+        with open(batch_file_path, "rb") as file:
+            input_file = await client.files.create(file=file, purpose="batch")
+
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+
+        print(f"Batch {batch.id} submitted. Polling for completion...")
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(10)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed":
+            print(f"Batch finished with status: {batch.status}")
+            return
+
+        output = await client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            result = json.loads(line)
+            content = result["response"]["body"]["choices"][0]["message"]["content"]
+            print(f"OpenAI Batch Response [{result['custom_id']}]:", content)
+    finally:
+        os.unlink(batch_file_path)
+
+
+# Constant user message reused across iterations instead of rebuilding
+# the dict on every call
+USER_MESSAGE = {"role": "user", "content": "Tell me a joke with only two sentences."}
+
+
+@spyglass_trace()
+async def call_openai_chat_api(client, model, system_prompt):
+    # Randomly raise an error 50% of the time; a single-bit draw is
+    # cheaper than random.random() < 0.5 and skips all API prep below
+    if random.getrandbits(1):
         raise Exception("Random error: Simulated failure for testing purposes")
 
     print("Attempting to call OpenAI Chat API...")
-    completion = client.chat.completions.create(
+    completion = await client.chat.completions.create(
         model=model,
         messages=[
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": "Tell me a joke with only two sentences."},
+            USER_MESSAGE,
         ],
     )
     if completion.choices:
@@ -41,6 +123,43 @@ def call_openai_chat_api(model, system_prompt):
         print("OpenAI Response: No choices returned")
 
 
+async def worker(sem, client, model, system_prompt):
+    """Issue one completion, bounded by the shared concurrency semaphore."""
+    async with sem:
+        try:
+            await call_openai_chat_api(client, model, system_prompt)
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+
+
+async def main(client, model, system_prompt):
+    """Fire rounds of concurrent completions instead of one blocking call."""
+    if os.getenv("OPENAI_USE_BATCH"):
+        # Batch mode: submit all prompts at once for 50% cost savings
+        prompts = [
+            "Tell me a joke with only two sentences."
+            for _ in range(int(os.getenv("OPENAI_BATCH_SIZE", "10")))
+        ]
+        try:
+            await batch_call_openai(client, model, system_prompt, prompts)
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+        return
+
+    print(
+        f"Starting OpenAI API call loop ({MAX_CONCURRENCY} concurrent calls "
+        "every 3 seconds)..."
+    )
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    while True:
+        # Overlap API latency across the whole round of in-flight requests
+        await asyncio.gather(
+            *(worker(sem, client, model, system_prompt) for _ in range(MAX_CONCURRENCY))
+        )
+        print("Waiting 3 seconds before next round...")
+        await asyncio.sleep(3)
+
+
 if __name__ == "__main__":
     # Check for required environment variables
     if not os.getenv("OPENAI_API_KEY"):
@@ -57,17 +176,17 @@ if __name__ == "__main__":
         model, system_prompt = load_model_config()
 
         API_KEY = os.getenv("OPENAI_API_KEY")
+        # Pool connections with keep-alive and HTTP/2 so the polling loop
+        # reuses TCP + TLS sessions instead of re-handshaking per call
+        http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+            timeout=httpx.Timeout(30.0, connect=5.0),
+        )
         # Wrap OpenAI client
-        client = spyglass_openai(OpenAI(api_key=API_KEY))
+        client = spyglass_openai(AsyncOpenAI(api_key=API_KEY, http_client=http_client))
 
-        print("Starting OpenAI API call loop (every 3 seconds)...")
         try:
-            while True:
-                try:
-                    call_openai_chat_api(model, system_prompt)
-                except Exception as e:
-                    print(f"An unexpected error occurred: {e}")
-                print("Waiting 3 seconds before next call...")
-                time.sleep(3)
+            asyncio.run(main(client, model, system_prompt))
         except KeyboardInterrupt:
             print("\nStopping the loop. Goodbye!")